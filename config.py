@@ -4,5 +4,12 @@
 NEO4J_CONFIG = {
     "URI": "neo4j://localhost:7687",
     "USER": "neo4j",
-    "PASSWORD": "alex12345"
+    "PASSWORD": "alex12345",
+    # Importer (data/2_Neo4jTripleImport2Neo4j.py) settings
+    "DATABASE": None,                       # None: the server's default database ("neo4j" for --bulk)
+    "IMPORT_WORKERS": 4,                    # concurrent batch transactions
+    "MAX_CONNECTION_POOL_SIZE": None,       # None: one connection per worker
+    "CONNECTION_ACQUISITION_TIMEOUT": 300,  # seconds
+    "MAX_CONNECTION_LIFETIME": 3600,        # seconds
+    "ADMIN_PATH": "neo4j-admin"             # neo4j-admin executable used by --bulk
 } 
\ No newline at end of file
@@ -1,7 +1,33 @@
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pa_csv
+from pyarrow import parquet as pq
+import codecs
 import os
 import shutil
-from typing import Dict, List, Tuple
+from typing import List, Tuple
+
+# Triple columns needed to build relationships
+RELATIONSHIP_COLUMNS = [
+    'x_type', 'x_name', 'x_source', 'x_external_source_id',
+    'relation', 'relation_name',
+    'y_type', 'y_name', 'y_source', 'y_external_source_id'
+]
+
+# Column types of relationships.csv (shared by every relationship part)
+RELATIONSHIP_SCHEMA = pa.schema([
+    ('START_ID', pa.string()),
+    ('END_ID', pa.string()),
+    ('TYPE', pa.string()),
+    ('is_effective', pa.int64())
+])
+
+# Columns of the property files
+PROPERTY_COLUMNS = [
+    'external_source_id', 'source_primary', 'source_secondary', 'title',
+    'source_link', 'source_date', 'pubmed_id', 'country_of_origin'
+]
 
 def select_environment() -> str:
     """Select environment (dev/prod)."""
@@ -19,6 +45,22 @@ def ensure_output_dir(env: str) -> str:
     os.makedirs(output_dir, exist_ok=True)
     return output_dir
 
+def read_csv_columns(path: str, columns: List[str]) -> pd.DataFrame:
+    """
+    Read the given columns of a CSV with Arrow's multithreaded reader.
+    
+    Every column is typed as a string, so no type inference pass is needed, and
+    columns missing from the file come back all-null. The Arrow table is handed
+    to pandas without copying the string buffers.
+    """
+    table = pa_csv.read_csv(path, convert_options=pa_csv.ConvertOptions(
+        column_types={col: pa.string() for col in columns},
+        include_columns=columns,
+        include_missing_columns=True,
+        strings_can_be_null=True
+    ))
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
 def load_data(env: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
     Load input data files.
@@ -26,56 +68,73 @@ def load_data(env: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
     Returns:
         Tuple[pd.DataFrame, pd.DataFrame]: (combined_df, properties_df)
     """
-    # Load main data files
-    primekg_df = pd.read_csv(f'{env}/input/1_kg.csv')
-    other_resources_df = pd.read_csv(f'{env}/input/2_other_resources_triple.csv')
-    cochrane_df = pd.read_csv(f'{env}/input/2_cochranelibrary_triple.csv')
+    # Load main data files (only the columns used downstream; 1_kg.csv has no
+    # relation_name or external_source_id columns, which come back empty)
+    primekg_df = read_csv_columns(f'{env}/input/1_kg.csv', RELATIONSHIP_COLUMNS)
+    other_resources_df = read_csv_columns(f'{env}/input/2_other_resources_triple.csv', RELATIONSHIP_COLUMNS)
+    cochrane_df = read_csv_columns(f'{env}/input/2_cochranelibrary_triple.csv', RELATIONSHIP_COLUMNS)
     
     # Load property files
-    other_properties_df = pd.read_csv(f'{env}/input/3_other_resources_property.csv')
-    cochrane_properties_df = pd.read_csv(f'{env}/input/3_cochranelibrary_property.csv')
-    
-    # Combine data
-    combined_df = pd.concat([primekg_df, other_resources_df, cochrane_df], ignore_index=True)
-    properties_df = pd.concat([other_properties_df, cochrane_properties_df], ignore_index=True)
+    other_properties_df = read_csv_columns(f'{env}/input/3_other_resources_property.csv', PROPERTY_COLUMNS)
+    cochrane_properties_df = read_csv_columns(f'{env}/input/3_cochranelibrary_property.csv', PROPERTY_COLUMNS)
+    
+    # Combine data (empty exports are skipped so they don't add a copy or
+    # affect the resulting column dtypes)
+    combined_df = pd.concat(
+        [d for d in (primekg_df, other_resources_df, cochrane_df) if not d.empty] or [primekg_df],
+        ignore_index=True
+    )
+    properties_df = pd.concat(
+        [d for d in (other_properties_df, cochrane_properties_df) if not d.empty] or [other_properties_df],
+        ignore_index=True
+    )
     
     return combined_df, properties_df
 
-def create_source_mapping(properties_df: pd.DataFrame) -> Dict[str, str]:
+def combine_property_files(src_paths: List[str], dst_path: str) -> None:
     """
-    Create mapping of source names to their external source IDs.
+    Concatenate property CSV files into one output file without re-parsing them.
+    
+    Rows are streamed as raw bytes; the UTF-8 BOM is dropped and only the header
+    of the first file is kept.
     """
-    mapping = {}
-    
-    for _, row in properties_df.iterrows():
-        source_id = row['external_source_id']
-        
-        # Map all possible names from properties
-        for field in ['source_primary', 'source_secondary', 'title']:
-            if pd.notna(row[field]):
-                name = str(row[field]).strip()
-                mapping[name] = source_id
-                mapping[name.lower()] = source_id
-        
-        # Map the ID itself
-        mapping[source_id] = source_id
-    
-    return mapping
+    header_written = False
+    with open(dst_path, 'wb') as dst:
+        for src_path in src_paths:
+            with open(src_path, 'rb') as src:
+                header = src.readline()
+                if not header:
+                    continue
+                if header.startswith(codecs.BOM_UTF8):
+                    header = header[len(codecs.BOM_UTF8):]
+                if not header_written:
+                    dst.write(header)
+                    header_written = True
+                shutil.copyfileobj(src, dst)
+                
+                # Make sure the next file starts on a new line
+                src.seek(-1, os.SEEK_END)
+                if src.read(1) != b'\n':
+                    dst.write(b'\n')
 
 def create_nodes(df: pd.DataFrame, properties_df: pd.DataFrame) -> pd.DataFrame:
     """
     Create nodes dataframe with proper handling of source IDs.
     """
-    # Extract all non-source nodes first
-    x_nodes = df[['x_type', 'x_name']].rename(columns={'x_type': 'TYPE', 'x_name': 'NAME'})
-    y_nodes = df[['y_type', 'y_name']].rename(columns={'y_type': 'TYPE', 'y_name': 'NAME'})
+    # Extract all non-source nodes first, deduplicating each side up front so the
+    # concat only copies distinct pairs. y rows are offset by len(df) so the index
+    # still gives each pair's position in the stacked x/y columns.
+    x_nodes = df[['x_type', 'x_name']].drop_duplicates().set_axis(['TYPE', 'NAME'], axis=1)
+    y_nodes = df[['y_type', 'y_name']].drop_duplicates().set_axis(['TYPE', 'NAME'], axis=1)
+    y_nodes.index = y_nodes.index + len(df)
     
-    # Combine and remove duplicates
-    nodes_df = pd.concat([x_nodes, y_nodes], ignore_index=True)
-    nodes_df = nodes_df[nodes_df['TYPE'] != 'source'].drop_duplicates()
+    # Combine and remove duplicates (a missing TYPE compares as NA on the Arrow
+    # columns, so the mask is filled explicitly to keep those nodes)
+    nodes_df = pd.concat([x_nodes, y_nodes])
+    nodes_df = nodes_df[~nodes_df['TYPE'].eq('source').fillna(False)].drop_duplicates()
     
-    # Add node IDs
-    nodes_df['NODE_ID'] = 'n_' + nodes_df.index.astype(str)
+    # Add node IDs (numbered by row position so IDs stay stable across runs)
+    nodes_df['NODE_ID'] = np.char.add('n_', nodes_df.index.to_numpy().astype(str))
     
     # Add empty property columns
     property_cols = ['source_primary', 'source_secondary', 'title', 
@@ -83,82 +142,68 @@ def create_nodes(df: pd.DataFrame, properties_df: pd.DataFrame) -> pd.DataFrame:
     for col in property_cols:
         nodes_df[col] = ''
     
-    # Process source nodes from properties file
-    source_nodes = []
-    processed_sources = set()
-    name_to_id_map = {}  # Map to track source names to their IDs
-    
     # Process guideline and other sources from properties file first
-    for _, row in properties_df.iterrows():
-        source_id = row['external_source_id']
-        if pd.isna(source_id):
-            continue
-        source_id = str(source_id)
-        if source_id in processed_sources:
-            continue
-        
-        # For Cochrane Library sources, use the original ID
-        if row['source_primary'] == 'Cochrane Library':
-            node_id = source_id
-        else:
-            # For other sources, keep using the es_ prefix
-            node_id = source_id if source_id.startswith('es_') else f'es_{len(processed_sources) + 1}'
-        
-        source_name = row['source_secondary']
-        name_to_id_map[str(source_name).lower()] = node_id
-        
-        source_nodes.append({
-            'TYPE': 'source',
-            'NAME': source_name,
-            'NODE_ID': node_id,
-            'source_primary': row['source_primary'],
-            'source_secondary': source_name,
-            'title': row['title'],
-            'source_link': row['source_link'],
-            'source_date': row['source_date'],
-            'pubmed_id': str(row['pubmed_id']) if pd.notna(row['pubmed_id']) else '',
-            'country_of_origin': str(row['country_of_origin']) if pd.notna(row['country_of_origin']) else ''
-        })
-        processed_sources.add(source_id)
-    
-    # Add PrimeKG source nodes
-    primekg_sources = pd.concat([
-        df[['x_source']].rename(columns={'x_source': 'source'}),
-        df[['y_source']].rename(columns={'y_source': 'source'})
-    ])['source'].unique()
-    
-    kg_source_counter = 0
-    for source_str in primekg_sources:
-        if pd.isna(source_str):
-            continue
-        source_str = str(source_str).strip()
-        source_lower = source_str.lower()
-        
-        # Skip if we've already processed this source
-        if source_lower in name_to_id_map or source_str in processed_sources:
-            continue
-            
-        source_nodes.append({
-            'TYPE': 'source',
-            'NAME': source_str,
-            'NODE_ID': f's_{kg_source_counter}',
-            'source_primary': 'PrimeKG',
-            'source_secondary': source_str,
-            'title': '',
-            'source_link': '',
-            'source_date': '',
-            'pubmed_id': '',
-            'country_of_origin': ''
-        })
-        name_to_id_map[source_lower] = f's_{kg_source_counter}'
-        processed_sources.add(source_str)
-        kg_source_counter += 1
-    
-    # Create source nodes dataframe
-    source_df = pd.DataFrame(source_nodes)
+    props = properties_df[properties_df['external_source_id'].notna()]
+    source_ids = props['external_source_id'].astype(str)
+    first_seen = ~source_ids.duplicated()
+    props, source_ids = props[first_seen], source_ids[first_seen].to_numpy(dtype=str)
+    
+    # Cochrane Library sources and es_ prefixed IDs keep their original ID,
+    # other sources get an es_ ID numbered by their position
+    # (a blank source_primary is NA on the Arrow columns and counts as not Cochrane)
+    keep_original_id = (
+        props['source_primary'].eq('Cochrane Library').to_numpy(dtype=bool, na_value=False)
+        | np.char.startswith(source_ids, 'es_')
+    )
+    fallback_ids = np.char.add('es_', np.arange(1, len(props) + 1).astype(str))
+    
+    source_df = pd.DataFrame({
+        'TYPE': 'source',
+        'NAME': props['source_secondary'].to_numpy(),
+        'NODE_ID': np.where(keep_original_id, source_ids, fallback_ids),
+        'source_primary': props['source_primary'].to_numpy(),
+        'source_secondary': props['source_secondary'].to_numpy(),
+        'title': props['title'].to_numpy(),
+        'source_link': props['source_link'].to_numpy(),
+        'source_date': props['source_date'].to_numpy(),
+        'pubmed_id': props['pubmed_id'].astype(str).where(props['pubmed_id'].notna(), '').to_numpy(),
+        'country_of_origin': props['country_of_origin'].astype(str).where(props['country_of_origin'].notna(), '').to_numpy()
+    })
+    processed_sources = set(source_ids)
+    
+    # Add PrimeKG source nodes (ordered union of x/y sources, first occurrence wins)
+    primekg_sources = pd.Series(pd.unique(np.concatenate([
+        df['x_source'].dropna().to_numpy(dtype=object),
+        df['y_source'].dropna().to_numpy(dtype=object)
+    ])))
+    source_names = primekg_sources.astype(str).str.strip()
+    source_lower = source_names.str.lower()
+    
+    # Skip sources already covered by the properties file, then keep the first
+    # spelling of each remaining name (case-insensitive)
+    is_new = (
+        ~source_lower.isin(set(props['source_secondary'].astype(str).str.lower()))
+        & ~source_names.isin(processed_sources)
+    )
+    source_names, source_lower = source_names[is_new], source_lower[is_new]
+    kg_source_names = source_names[~source_lower.duplicated()].tolist()
+    
+    # Build PrimeKG source nodes column-wise in one go
+    kg_source_df = pd.DataFrame({
+        'TYPE': 'source',
+        'NAME': kg_source_names,
+        'NODE_ID': np.char.add('s_', np.arange(len(kg_source_names)).astype(str)),
+        'source_primary': 'PrimeKG',
+        'source_secondary': kg_source_names,
+        'title': '',
+        'source_link': '',
+        'source_date': '',
+        'pubmed_id': '',
+        'country_of_origin': ''
+    })
     
     # Combine all nodes
-    final_nodes_df = pd.concat([nodes_df, source_df], ignore_index=True)
+    final_nodes_df = pd.concat([nodes_df, source_df, kg_source_df], ignore_index=True)
     
     # Ensure proper column order
     columns = ['TYPE', 'NAME', 'NODE_ID'] + property_cols
@@ -166,29 +211,36 @@ def create_nodes(df: pd.DataFrame, properties_df: pd.DataFrame) -> pd.DataFrame:
     
     return final_nodes_df
 
-def create_relationships(df: pd.DataFrame, nodes_df: pd.DataFrame, properties_df: pd.DataFrame) -> pd.DataFrame:
+def create_relationships(df: pd.DataFrame, nodes_df: pd.DataFrame) -> List[pd.DataFrame]:
     """
-    Create relationships dataframe with proper source handling, and include is_effective as a property.
+    Create relationships with proper source handling, and include is_effective as a property.
+    
+    Returns:
+        List[pd.DataFrame]: deduplicated relationship parts (main relationships first,
+        then SOURCE relationships) to be written one after another
     """
-    # Create main relationships
-    df = df.merge(
-        nodes_df[['TYPE', 'NAME', 'NODE_ID']],
-        left_on=['x_type', 'x_name'],
-        right_on=['TYPE', 'NAME'],
-        how='left'
-    ).rename(columns={'NODE_ID': 'START_ID'})
-    
-    df = df.merge(
-        nodes_df[['TYPE', 'NAME', 'NODE_ID']],
-        left_on=['y_type', 'y_name'],
-        right_on=['TYPE', 'NAME'],
-        how='left',
-        suffixes=('_x', '_y')
-    ).rename(columns={'NODE_ID': 'END_ID'})
-    
-    # Get source mappings
-    source_mapping = create_source_mapping(properties_df)
-    node_mapping = nodes_df[nodes_df['TYPE'] == 'source'].set_index('NAME')['NODE_ID'].to_dict()
+    # Only keep the columns used below
+    df = df[[col for col in RELATIONSHIP_COLUMNS if col in df.columns]]
+    
+    # Create main relationships: factorize the node table's and both endpoints'
+    # (TYPE, NAME) pairs together so every pair becomes one integer key, then look
+    # the endpoint keys up among the node keys instead of merging df per side
+    # (duplicate source names resolve to the first node, as in node_mapping below)
+    node_keys = nodes_df.drop_duplicates(['TYPE', 'NAME'])
+    n_nodes, n_rows = len(node_keys), len(df)
+    type_codes, _ = pd.factorize(pd.concat([node_keys['TYPE'], df['x_type'], df['y_type']], ignore_index=True))
+    name_codes, names = pd.factorize(pd.concat([node_keys['NAME'], df['x_name'], df['y_name']], ignore_index=True))
+    # Missing values get code -1, which still yields a key no other pair uses
+    pair_keys = type_codes.astype(np.int64) * (len(names) + 1) + name_codes
+    node_index = pd.Index(pair_keys[:n_nodes])
+    # Unmatched pairs get position -1, which picks the trailing None
+    node_id_values = np.append(node_keys['NODE_ID'].to_numpy(dtype=object), None)
+    df['START_ID'] = node_id_values[node_index.get_indexer(pair_keys[n_nodes:n_nodes + n_rows])]
+    df['END_ID'] = node_id_values[node_index.get_indexer(pair_keys[n_nodes + n_rows:])]
+    
+    # First source node wins for a given name
+    source_nodes = nodes_df[nodes_df['TYPE'].eq('source').fillna(False)]
+    node_mapping = source_nodes.dropna(subset=['NAME']).drop_duplicates('NAME').set_index('NAME')['NODE_ID']
     
     # Create relationships list
     relationships = []
@@ -198,70 +250,76 @@ def create_relationships(df: pd.DataFrame, nodes_df: pd.DataFrame, properties_df
         main_rels = df[['START_ID', 'END_ID', 'relation', 'relation_name']].dropna(subset=['START_ID', 'END_ID', 'relation'])
         main_rels = main_rels.rename(columns={'relation': 'TYPE', 'relation_name': 'is_effective'})
         # 將 is_effective 轉為 int，無法轉換時設為 None
-        main_rels['is_effective'] = pd.to_numeric(main_rels['is_effective'], errors='coerce').astype('Int64')
+        # (parsed from a plain string column: to_numeric's coerce path fails on Arrow strings)
+        main_rels['is_effective'] = pd.to_numeric(
+            main_rels['is_effective'].astype('string'), errors='coerce', dtype_backend='numpy_nullable'
+        ).astype('Int64')
     else:
         main_rels = df[['START_ID', 'END_ID', 'relation']].dropna(subset=['START_ID', 'END_ID', 'relation'])
-        main_rels['is_effective'] = pd.NA
+        main_rels['is_effective'] = pd.Series(pd.NA, index=main_rels.index, dtype='Int64')
         main_rels = main_rels.rename(columns={'relation': 'TYPE'})
     relationships.append(main_rels)
     
-    # Create source relationships
-    source_rels = []
-    
-    for _, row in df.iterrows():
-        # Handle external source IDs
-        if pd.notna(row['x_external_source_id']):
-            source_rels.append({
-                'START_ID': row['START_ID'],
-                'END_ID': row['x_external_source_id'],
-                'TYPE': 'SOURCE',
-                'is_effective': pd.NA
-            })
-        
-        if pd.notna(row['y_external_source_id']):
-            source_rels.append({
-                'START_ID': row['END_ID'],
-                'END_ID': row['y_external_source_id'],
-                'TYPE': 'SOURCE',
-                'is_effective': pd.NA
-            })
-        
-        # Handle regular sources and PrimeKG sources
-        for source_type, node_id in [('x_source', 'START_ID'), ('y_source', 'END_ID')]:
-            if pd.notna(row[source_type]):
-                source_str = str(row[source_type]).strip()
-                source_lower = source_str.lower()
-                
-                # Try to find the source node ID
-                source_node = nodes_df[
-                    (nodes_df['TYPE'] == 'source') & 
-                    ((nodes_df['NAME'] == source_str) | 
-                     (nodes_df['source_secondary'] == source_str))
-                ]
-                
-                if not source_node.empty:
-                    source_id = source_node.iloc[0]['NODE_ID']
-                    source_rels.append({
-                        'START_ID': row[node_id],
-                        'END_ID': source_id,
-                        'TYPE': 'SOURCE',
-                        'is_effective': pd.NA
-                    })
+    # Create source relationships (gathered as plain arrays, built into one frame)
+    start_ids, end_ids = [], []
+    
+    # Handle external source IDs
+    for node_id, ext_col in [('START_ID', 'x_external_source_id'), ('END_ID', 'y_external_source_id')]:
+        has_ext = df[ext_col].notna().to_numpy()
+        start_ids.append(df[node_id].to_numpy(dtype=object)[has_ext])
+        end_ids.append(df[ext_col].to_numpy(dtype=object)[has_ext])
+    
+    # Handle regular sources and PrimeKG sources
+    for node_id, source_col in [('START_ID', 'x_source'), ('END_ID', 'y_source')]:
+        # Resolve each distinct source name once, then broadcast back by code
+        # (missing sources get code -1, which picks the trailing None)
+        codes, names = pd.factorize(df[source_col])
+        name_ids = pd.Index(names).astype(str).str.strip().map(node_mapping).to_numpy(dtype=object)
+        source_ids = np.append(name_ids, None)[codes]
+        matched = pd.notna(source_ids)
+        start_ids.append(df[node_id].to_numpy(dtype=object)[matched])
+        end_ids.append(source_ids[matched])
     
     # Add source relationships
-    if source_rels:
-        relationships.append(pd.DataFrame(source_rels))
-    
-    # Combine all relationships
-    final_rels_df = pd.concat(relationships, ignore_index=True)
-    # 確保 is_effective 欄位存在且型態為 Int64
-    if 'is_effective' not in final_rels_df.columns:
-        final_rels_df['is_effective'] = pd.NA
-    final_rels_df['is_effective'] = final_rels_df['is_effective'].astype('Int64')
-    # Remove duplicates and ensure proper column order
-    final_rels_df = final_rels_df[['START_ID', 'END_ID', 'TYPE', 'is_effective']].drop_duplicates()
-    
-    return final_rels_df
+    start_ids, end_ids = np.concatenate(start_ids), np.concatenate(end_ids)
+    if len(start_ids):
+        source_rels = pd.DataFrame({'START_ID': start_ids, 'END_ID': end_ids, 'TYPE': 'SOURCE'})
+        source_rels['is_effective'] = pd.Series(pd.NA, index=source_rels.index, dtype='Int64')
+        relationships.append(source_rels)
+    
+    # Main and SOURCE relationships differ in TYPE, so each part can be deduplicated on its own
+    for i, rels in enumerate(relationships):
+        # Remove duplicates (an edge is identified by its endpoints and type; the
+        # first is_effective wins) and ensure proper column order
+        rels = rels[['START_ID', 'END_ID', 'TYPE', 'is_effective']]
+        relationships[i] = rels.drop_duplicates(subset=['START_ID', 'END_ID', 'TYPE'])
+    
+    return relationships
+
+def write_csv(df: pd.DataFrame, path: str) -> None:
+    """Write an output table with Arrow's CSV writer (string values are always quoted)."""
+    pa_csv.write_csv(pa.Table.from_pandas(df, preserve_index=False), path)
+
+def write_relationships(relationships: List[pd.DataFrame], path: str) -> None:
+    """Write relationship parts to a single CSV, streaming each part after the first."""
+    with pa_csv.CSVWriter(path, RELATIONSHIP_SCHEMA) as writer:
+        for rels in relationships:
+            writer.write_table(pa.Table.from_pandas(rels, schema=RELATIONSHIP_SCHEMA, preserve_index=False))
+
+def write_parquet(df: pd.DataFrame, path: str) -> None:
+    """Write a columnar, zstd-compressed copy of an output table."""
+    df.to_parquet(path, index=False, compression='zstd')
+
+def write_relationships_parquet(relationships: List[pd.DataFrame], path: str) -> None:
+    """Write relationship parts to a single Parquet file, one row group per part, without concatenating them."""
+    # Take the pandas metadata from an empty concat, so the file reads back with the
+    # dtypes the concatenated frame would have
+    empty = pd.concat([rels.iloc[:0] for rels in relationships], ignore_index=True)
+    schema = pa.Table.from_pandas(empty, schema=RELATIONSHIP_SCHEMA, preserve_index=False).schema
+    with pq.ParquetWriter(path, schema, compression='zstd') as writer:
+        for rels in relationships:
+            writer.write_table(pa.Table.from_pandas(rels, schema=RELATIONSHIP_SCHEMA, preserve_index=False)
+                               .replace_schema_metadata(schema.metadata))
 
 def main():
     """Main function to convert data to Neo4j format."""
@@ -281,20 +339,23 @@ def main():
     
     # Create relationships
     print("Creating relationships...")
-    relationships_df = create_relationships(df, nodes_df, properties_df)
+    relationships = create_relationships(df, nodes_df)
     
     # Save results
     print(f"Saving results to {output_dir}...")
-    nodes_df.to_csv(f'{output_dir}/nodes.csv', index=False)
-    relationships_df.to_csv(f'{output_dir}/relationships.csv', index=False)
+    write_csv(nodes_df, f'{output_dir}/nodes.csv')
+    write_relationships(relationships, f'{output_dir}/relationships.csv')
+    write_parquet(nodes_df, f'{output_dir}/nodes.parquet')
+    write_relationships_parquet(relationships, f'{output_dir}/relationships.parquet')
     
     # Combine and save property files
     print("Combining and saving property files...")
-    combined_properties = pd.concat([
-        pd.read_csv(f'{env}/input/3_other_resources_property.csv'),
-        pd.read_csv(f'{env}/input/3_cochranelibrary_property.csv')
-    ], ignore_index=True)
-    combined_properties.to_csv(f'{output_dir}/other_resources_property.csv', index=False)
+    combine_property_files(
+        [f'{env}/input/3_other_resources_property.csv',
+         f'{env}/input/3_cochranelibrary_property.csv'],
+        f'{output_dir}/other_resources_property.csv'
+    )
+    write_parquet(properties_df, f'{output_dir}/other_resources_property.parquet')
     
     print("Conversion completed successfully!")
 
@@ -1,7 +1,12 @@
 from neo4j import GraphDatabase
+from neo4j.exceptions import Neo4jError
+import pandas as pd
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 import os
+import re
+import subprocess
 import sys
 
 # Add project root to Python path to import config
@@ -14,138 +19,308 @@ def print_execution_time(start_time, operation_name):
     execution_time = end_time - start_time
     print(f"{operation_name} completed in {execution_time:.2f} seconds")
 
+def read_rows(csv_file_path):
+    """Read an output CSV as strings, the same way LOAD CSV sees it (empty cells as '')."""
+    return pd.read_csv(csv_file_path, dtype=str, keep_default_na=False, encoding='utf-8-sig')
+
+def read_output(csv_file_path):
+    """
+    Read an output table, preferring the Parquet copy written next to the CSV.
+    
+    Parquet skips CSV parsing; its nulls are turned back into '' so both sources
+    give the same rows (is_effective keeps its integer type). The Parquet copies are
+    regenerated artifacts that are not committed, so one older than its CSV is ignored.
+    """
+    parquet_path = os.path.splitext(csv_file_path)[0] + '.parquet'
+    if (not os.path.exists(parquet_path)
+            or os.path.getmtime(parquet_path) < os.path.getmtime(csv_file_path)):
+        return read_rows(csv_file_path)
+    df = pd.read_parquet(parquet_path)
+    text_columns = [col for col in df.columns if col != 'is_effective']
+    df[text_columns] = df[text_columns].astype(object).fillna('')
+    return df
+
+def blank_to_null(df, columns):
+    """Return a copy of df with empty strings in columns replaced by None (sent to Neo4j as null)."""
+    df = df.copy()
+    df[columns] = df[columns].where(df[columns] != '', None)
+    return df
+
+def iter_batches(df, batch_size):
+    """Yield consecutive slices of df as lists of row dicts."""
+    for start in range(0, len(df), batch_size):
+        yield df.iloc[start:start + batch_size].to_dict('records')
+
+def escape_name(name):
+    """Backtick-quote a label or index name for use in Cypher (node types contain '/')."""
+    return "`" + name.replace("`", "``") + "`"
+
+def admin_import_command(admin_path, database, nodes_path, relationships_path):
+    """Build the neo4j-admin import command line for the installed Neo4j version."""
+    version = subprocess.run([admin_path, "--version"], capture_output=True, text=True, check=True).stdout
+    match = re.search(r"(\d+)\.\d+", version)
+    options = [
+        f"--nodes={nodes_path}",
+        f"--relationships={relationships_path}",
+        "--id-type=STRING",
+        "--ignore-empty-strings=true"
+    ]
+    if match and int(match.group(1)) < 5:
+        return [admin_path, "import", f"--database={database}", *options, "--force"]
+    return [admin_path, "database", "import", "full", *options, "--overwrite-destination", database]
+
+# Node properties carried over from nodes.csv besides name/type/nodeID
+NODE_PROPERTIES = ['source_primary', 'source_secondary', 'title', 'source_link',
+                   'source_date', 'pubmed_id', 'country_of_origin']
+
 class Neo4jImporter:
-    def __init__(self, uri, username, password):
-        self.driver = GraphDatabase.driver(uri, auth=(username, password))
+    def __init__(self, uri, username, password, workers=4, max_connection_pool_size=None,
+                 connection_acquisition_timeout=300, max_connection_lifetime=3600, database=None):
+        # One driver (and so one connection pool) shared by every import step. The pool
+        # defaults to one connection per concurrent batch, so batches never wait on it.
+        self.driver = GraphDatabase.driver(
+            uri,
+            auth=(username, password),
+            max_connection_pool_size=max_connection_pool_size or workers,
+            connection_acquisition_timeout=connection_acquisition_timeout,
+            max_connection_lifetime=max_connection_lifetime,
+            keep_alive=True
+        )
+        # Number of batch transactions kept in flight at once
+        self.workers = workers
+        # Database that is cleared and imported into; every session below targets it
+        self.database = database or self.default_database()
 
     def close(self):
         self.driver.close()
 
-    def create_indexes(self):
-        with self.driver.session() as session:
+    def default_database(self):
+        """Name of the server's default database (what a session without a database uses)."""
+        with self.driver.session(database="system") as session:
+            return session.run("SHOW DEFAULT DATABASE YIELD name").single()["name"]
+
+    def create_indexes(self, labels):
+        with self.driver.session(database=self.database) as session:
             try:
                 # Drop any existing indexes first
-                session.run("DROP INDEX source_nodeID IF EXISTS")
-                session.run("DROP INDEX guideline_nodeID IF EXISTS")
-                session.run("DROP INDEX concept_nodeID IF EXISTS")
+                for label in labels:
+                    session.run(f"DROP INDEX {escape_name(label + '_nodeID')} IF EXISTS")
                 
-                # Create fresh indexes with specific configurations for better performance
-                session.run("CREATE INDEX source_nodeID FOR (n:source) ON (n.nodeID)")
-                session.run("CREATE INDEX guideline_nodeID FOR (n:guideline) ON (n.nodeID)")
-                session.run("CREATE INDEX concept_nodeID FOR (n:concept) ON (n.nodeID)")
+                # One nodeID index per node label, so label-qualified MATCHes are index seeks
+                for label in labels:
+                    session.run(
+                        f"CREATE INDEX {escape_name(label + '_nodeID')} FOR (n:{escape_name(label)}) ON (n.nodeID)"
+                    )
+                session.run("CALL db.awaitIndexes()")
             except Exception as e:
                 print(f"Warning: Index operation failed - {str(e)}")
 
-    def drop_indexes(self):
-        with self.driver.session() as session:
+    def drop_indexes(self, labels):
+        with self.driver.session(database=self.database) as session:
             try:
                 # Drop existing indexes if they exist
-                session.run("DROP INDEX source_nodeID IF EXISTS")
-                session.run("DROP INDEX guideline_nodeID IF EXISTS")
-                session.run("DROP INDEX concept_nodeID IF EXISTS")
+                for label in labels:
+                    session.run(f"DROP INDEX {escape_name(label + '_nodeID')} IF EXISTS")
             except Exception as e:
                 print(f"Warning: Index dropping failed - {str(e)}")
 
-    def import_nodes(self, csv_file_path):
-        with self.driver.session() as session:
-            query = """
-            CALL {
-                LOAD CSV WITH HEADERS FROM 'file:///' + $file_path AS row
-                CREATE (n)
-                WITH n, row
-                CALL apoc.create.addLabels(n, [row.TYPE]) YIELD node
-                SET node.nodeID = row.NODE_ID,
-                    node.name = row.NAME,
-                    node.type = row.TYPE,
-                    node.source_primary = CASE WHEN row.source_primary <> '' THEN row.source_primary ELSE null END,
-                    node.source_secondary = CASE WHEN row.source_secondary <> '' THEN row.source_secondary ELSE null END,
-                    node.title = CASE WHEN row.title <> '' THEN row.title ELSE null END,
-                    node.source_link = CASE WHEN row.source_link <> '' THEN row.source_link ELSE null END,
-                    node.source_date = CASE WHEN row.source_date <> '' THEN row.source_date ELSE null END,
-                    node.pubmed_id = CASE WHEN row.pubmed_id <> '' THEN row.pubmed_id ELSE null END,
-                    node.country_of_origin = CASE WHEN row.country_of_origin <> '' THEN row.country_of_origin ELSE null END
-                RETURN count(*) as cnt
-            } IN TRANSACTIONS OF 10000 ROWS
-            RETURN sum(cnt)
+    def _run_batches(self, query, df, batch_size):
+        """
+        Send df to the server in batches of batch_size rows, one transaction each.
+        
+        Up to self.workers batches run concurrently, each in its own session, so the
+        next batch is already on the wire while the previous ones commit. Lock
+        conflicts between batches are retried by execute_write.
+        """
+        def write_batch(rows):
+            with self.driver.session(database=self.database) as session:
+                session.execute_write(lambda tx: tx.run(query, rows=rows).consume())
+        
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending = set()
+            for rows in iter_batches(df, batch_size):
+                # Only materialise a few batches ahead of the ones being written
+                if len(pending) >= self.workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                pending.add(executor.submit(write_batch, rows))
+            for future in pending:
+                future.result()
+
+    def import_nodes(self, nodes):
+        # One query per node type, so the label is static instead of set through APOC per row
+        # (the database is emptied before import, so CREATE is used rather than MERGE)
+        # Rows are sent already named and nulled like the node properties, so the server
+        # just copies the map; null entries are skipped by SET
+        rows = nodes.rename(columns={'NODE_ID': 'nodeID', 'NAME': 'name', 'TYPE': 'type'})
+        rows = blank_to_null(rows[['nodeID', 'name', 'type', *NODE_PROPERTIES]], NODE_PROPERTIES)
+        for label, group in rows.groupby('type', sort=False):
+            query = f"""
+            UNWIND $rows AS row
+            CREATE (node:{escape_name(label)})
+            SET node = row
             """
-            session.run(query, file_path=csv_file_path)
-
-    def import_relationships(self, csv_file_path):
-        with self.driver.session() as session:
-            query = """
-            CALL {
-                LOAD CSV WITH HEADERS FROM 'file:///' + $file_path AS row
-                MATCH (source {nodeID: row.START_ID})
-                MATCH (target {nodeID: row.END_ID})
-                WITH source, target, row,
-                     (CASE WHEN row.is_effective IS NOT NULL AND row.is_effective <> '' 
-                           THEN apoc.map.fromPairs([['is_effective', toInteger(row.is_effective)]]) 
-                           ELSE {} END) AS rel_props
-                CALL apoc.create.relationship(source, row.TYPE, rel_props, target) YIELD rel
-                RETURN count(*) as cnt
-            } IN TRANSACTIONS OF 2000 ROWS
-            RETURN sum(cnt) as total
+            self._run_batches(query, group, 10000)
+
+    def import_relationships(self, csv_file_path, nodes):
+        relationships = read_output(csv_file_path)
+        
+        # Look up both endpoint labels so each MATCH can use the per-label nodeID index
+        node_labels = nodes.set_index('NODE_ID')['TYPE']
+        relationships['START_LABEL'] = relationships['START_ID'].map(node_labels)
+        relationships['END_LABEL'] = relationships['END_ID'].map(node_labels)
+        relationships = relationships.dropna(subset=['START_LABEL', 'END_LABEL'])
+
+        # Convert is_effective here rather than per row in Cypher (blank -> null)
+        is_effective = pd.to_numeric(relationships['is_effective'], errors='coerce').astype('Int64')
+        relationships['is_effective'] = is_effective.astype(object).where(is_effective.notna(), None)
+
+        # Labels and relationship type are static per group, so no APOC call is needed per row
+        groups = relationships.groupby(['START_LABEL', 'END_LABEL', 'TYPE'], sort=False)
+        for (start_label, end_label, rel_type), rels in groups:
+            query = f"""
+            UNWIND $rows AS row
+            MATCH (source:{escape_name(start_label)} {{nodeID: row.START_ID}})
+            MATCH (target:{escape_name(end_label)} {{nodeID: row.END_ID}})
+            CREATE (source)-[rel:{escape_name(rel_type)}]->(target)
+            SET rel.is_effective = row.is_effective
             """
-            session.run(query, file_path=csv_file_path)
+            self._run_batches(query, rels[['START_ID', 'END_ID', 'is_effective']], 2000)
 
     def import_external_source_properties(self, csv_file_path):
-        with self.driver.session() as session:
-            query = """
-            CALL {
-                LOAD CSV WITH HEADERS FROM 'file:///' + $file_path AS row
-                MATCH (n {nodeID: row.external_source_id})
-                SET n.name = row.title,
-                    n.source_primary = row.source_primary,
-                    n.source_secondary = row.source_secondary,
-                    n.source_link = row.source_link,
-                    n.source_date = row.source_date,
-                    n.pubmed_id = CASE WHEN row.pubmed_id <> '' THEN row.pubmed_id ELSE null END,
-                    n.country_of_origin = CASE WHEN row.country_of_origin <> '' THEN row.country_of_origin ELSE null END
-                RETURN count(*) as cnt
-            } IN TRANSACTIONS OF 5000 ROWS
-            RETURN sum(cnt)
-            """
-            session.run(query, file_path=csv_file_path)
+        query = """
+        UNWIND $rows AS row
+        MATCH (n:source {nodeID: row.external_source_id})
+        SET n.name = row.title,
+            n.source_primary = row.source_primary,
+            n.source_secondary = row.source_secondary,
+            n.source_link = row.source_link,
+            n.source_date = row.source_date,
+            n.pubmed_id = row.pubmed_id,
+            n.country_of_origin = row.country_of_origin
+        """
+        properties = blank_to_null(read_output(csv_file_path), ['pubmed_id', 'country_of_origin'])
+        self._run_batches(query, properties, 5000)
+
+    @staticmethod
+    def bulk_import(output_dir, database="neo4j"):
+        """
+        Offline initial load with neo4j-admin import (4.x or 5.x command syntax).
+        
+        Writes copies of the output CSVs with the header format neo4j-admin expects,
+        with the external source properties already applied to the source nodes,
+        then replaces the database. Neo4j must be stopped while this runs.
+        """
+        nodes = read_output(os.path.join(output_dir, "nodes.csv")).set_index('NODE_ID', drop=False)
+        relationships = read_output(os.path.join(output_dir, "relationships.csv"))
+        properties = read_output(os.path.join(output_dir, "other_resources_property.csv"))
+        
+        # Same result as import_external_source_properties (later rows win)
+        properties = properties[properties['external_source_id'] != '']
+        properties = properties.drop_duplicates('external_source_id', keep='last').set_index('external_source_id')
+        ids = nodes.index[nodes['TYPE'] == 'source'].intersection(properties.index)
+        nodes.loc[ids, 'NAME'] = properties.loc[ids, 'title']
+        for col in NODE_PROPERTIES:
+            if col != 'title':
+                nodes.loc[ids, col] = properties.loc[ids, col]
+        
+        nodes_path = os.path.join(output_dir, "admin_nodes.csv")
+        relationships_path = os.path.join(output_dir, "admin_relationships.csv")
+        admin_nodes = pd.DataFrame({
+            ':LABEL': nodes['TYPE'],
+            'nodeID:ID': nodes['NODE_ID'],
+            'name': nodes['NAME'],
+            'type': nodes['TYPE'],
+            **{col: nodes[col] for col in NODE_PROPERTIES}
+        })
+        admin_nodes.to_csv(nodes_path, index=False)
+        # Skip relationships with an endpoint that is not a node, as the online import
+        # does; neo4j-admin would otherwise abort the whole import on them
+        relationships = relationships[
+            relationships['START_ID'].isin(nodes.index) & relationships['END_ID'].isin(nodes.index)
+        ]
+        relationships.rename(columns={
+            'START_ID': ':START_ID',
+            'END_ID': ':END_ID',
+            'TYPE': ':TYPE',
+            'is_effective': 'is_effective:int'
+        }).to_csv(relationships_path, index=False)
+        
+        subprocess.run(admin_import_command(
+            NEO4J_CONFIG.get("ADMIN_PATH", "neo4j-admin"), database, nodes_path, relationships_path
+        ), check=True)
 
     def delete_all_data(self):
-        with self.driver.session() as session:
-            session.run("MATCH (n) DETACH DELETE n")
+        database = self.database
+        try:
+            # Recreating the database is near-instant and writes no transaction log,
+            # but administration commands need Enterprise edition
+            with self.driver.session(database="system") as session:
+                session.run(f"CREATE OR REPLACE DATABASE {escape_name(database)} WAIT").consume()
+        except Neo4jError:
+            # Otherwise delete in batches so no single transaction holds the whole graph
+            with self.driver.session(database=database) as session:
+                session.run(
+                    "MATCH (n) CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF 10000 ROWS"
+                ).consume()
+
+# Usage example (pass "prod" to import data/prod/output instead of data/dev/output,
+# and "--bulk" for an offline neo4j-admin import into a stopped database)
+args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+env = args[0] if args else "dev"
+output_dir = os.path.join(project_root, "data", env, "output")
 
-# Usage example
 start_total = time.time()
 print(f"\nStarting import process at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
+if "--bulk" in sys.argv:
+    # The server is stopped, so its default database cannot be looked up; DATABASE
+    # falls back to "neo4j", the default name
+    Neo4jImporter.bulk_import(output_dir, NEO4J_CONFIG.get("DATABASE") or "neo4j")
+    print_execution_time(start_total, "\nTotal execution time")
+    print("Start Neo4j to use the imported database.")
+    sys.exit(0)
+
 importer = Neo4jImporter(
     NEO4J_CONFIG["URI"],
     NEO4J_CONFIG["USER"],
-    NEO4J_CONFIG["PASSWORD"]
+    NEO4J_CONFIG["PASSWORD"],
+    workers=NEO4J_CONFIG.get("IMPORT_WORKERS", 4),
+    max_connection_pool_size=NEO4J_CONFIG.get("MAX_CONNECTION_POOL_SIZE"),
+    connection_acquisition_timeout=NEO4J_CONFIG.get("CONNECTION_ACQUISITION_TIMEOUT", 300),
+    max_connection_lifetime=NEO4J_CONFIG.get("MAX_CONNECTION_LIFETIME", 3600),
+    database=NEO4J_CONFIG.get("DATABASE")
 )
 
 try:
+    nodes = read_output(os.path.join(output_dir, "nodes.csv"))
+    labels = nodes['TYPE'].unique().tolist()
+
     # Delete all data and prepare database
     start_time = time.time()
     importer.delete_all_data()
-    importer.drop_indexes()
+    importer.drop_indexes(labels)
     print_execution_time(start_time, "Deleting all data")
 
-    # Create indexes before import
+    # Import nodes (no indexes yet, so node creation doesn't maintain them row by row)
     start_time = time.time()
-    importer.create_indexes()
-    print_execution_time(start_time, "Creating indexes")
+    importer.import_nodes(nodes)
+    print_execution_time(start_time, "Importing nodes")
 
-    # Import nodes
+    # Create indexes once the nodes exist; the relationship MATCHes need them
     start_time = time.time()
-    importer.import_nodes("nodes.csv")
-    print_execution_time(start_time, "Importing nodes")
+    importer.create_indexes(labels)
+    print_execution_time(start_time, "Creating indexes")
 
     # Import relationships
     start_time = time.time()
-    importer.import_relationships("relationships.csv")
+    importer.import_relationships(os.path.join(output_dir, "relationships.csv"), nodes)
     print_execution_time(start_time, "Importing relationships")
 
     # Import external source properties
     start_time = time.time()
-    importer.import_external_source_properties("other_resources_property.csv")
+    importer.import_external_source_properties(os.path.join(output_dir, "other_resources_property.csv"))
     print_execution_time(start_time, "Importing external source properties")
 
     print_execution_time(start_total, "\nTotal execution time")
@@ -6,7 +6,8 @@ setup(
     packages=find_packages(),
     install_requires=[
         "streamlit",
-        "pandas",
+        "pandas>=2.0",
+        "pyarrow",
         "pyvis",
         "neo4j",
         "plotly"
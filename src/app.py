@@ -1,5 +1,5 @@
 import streamlit as st
-from utils.data_loader import load_data
+from utils.data_loader import load_data, get_data_stats
 import tabs
 import os
 import sys
@@ -50,10 +50,11 @@ def main():
     # 顯示數據統計資訊
     st.sidebar.markdown("---")
     st.sidebar.subheader("數據統計")
-    st.sidebar.write(f"節點總數: {len(nodes_df)}")
-    st.sidebar.write(f"關係總數: {len(relationships_df)}")
-    st.sidebar.write(f"節點類型數: {len(nodes_df['type'].unique())}")
-    st.sidebar.write(f"關係類型數: {len(relationships_df['predicate'].unique())}")
+    stats = get_data_stats(nodes_df, relationships_df)
+    st.sidebar.write(f"節點總數: {stats['node_count']}")
+    st.sidebar.write(f"關係總數: {stats['relationship_count']}")
+    st.sidebar.write(f"節點類型數: {stats['node_type_count']}")
+    st.sidebar.write(f"關係類型數: {stats['relationship_type_count']}")
     
     # 側邊欄：功能選擇
     st.sidebar.title("功能選擇")
@@ -1,6 +1,10 @@
+import re
 import streamlit as st
 import pandas as pd
-from utils.data_loader import get_node_by_id
+from utils.data_loader import (
+    frame_cache_key, get_node_index, get_nodes_by_type, get_relationship_index, get_type_index,
+    lookup_relationships
+)
 
 # 1. 定義疾病階段 group 與關鍵字 mapping
 STAGE_MAPPING = {
@@ -28,9 +32,10 @@ def match_stage_nodes(nodes_df, group_keywords):
             matched.append(group_name)
     return list(set(matched))
 
+STAGE_NOTE_PATTERN = re.compile(r"\\(.*?\\)")
+
 def normalize_stage_name(name):
-    import re
-    name = re.sub(r"\\(.*?\\)", "", name)
+    name = STAGE_NOTE_PATTERN.sub("", name)
     return name.replace(" ", "").lower()
 
 def is_treatment_recommended(treatment_id, stage_id, relationships_df):
@@ -53,143 +58,80 @@ def is_treatment_effective_for_disease(treatment_id, disease_id, relationships_d
         return int(rels.iloc[0].get('is_effective', 0)) == 1
     return False
 
-def get_applicable_stages(treatment_id, nodes_df, relationships_df):
+def get_applicable_stages(treatment_id, relationships_df, by_object, node_names):
     """獲取治療方案適用的所有階段"""
-    stage_relations = relationships_df[
-        (relationships_df['object'] == treatment_id) &
-        (relationships_df['predicate'] == 'STAGE_TREATMENT')
-    ]
+    stage_relations = lookup_relationships(relationships_df, by_object, (treatment_id, 'STAGE_TREATMENT'))
     stages = []
-    for _, rel in stage_relations.iterrows():
-        stage_name, _ = get_node_by_id(nodes_df, rel['subject'])
+    for stage_id in stage_relations['subject']:
+        stage_name = node_names.get(stage_id)
         if stage_name:
             stages.append(stage_name)
-    return stages
-
-def render(data):
-    """渲染快速診療指引頁面"""
-    st.markdown("""
-        <style>
-        .main-title { font-size: 1.7rem; font-weight: 400; color: #222; margin-bottom: 0.2em; letter-spacing: 1px; }
-        .page-title { font-size: 1.7rem; font-weight: 400; color: #555; margin-bottom: 0.1em; letter-spacing: 0.5px; }
-        .section-title { font-size: 1.25rem; font-weight: 400; color: #888; margin-bottom: 0.8em; letter-spacing: 0.5px; }
-        .metric-label { color: #888; font-size: 1.1rem; margin-bottom: 0.1em; }
-        .metric-value { font-size: 2.5rem; font-weight: 700; color: #222; }
-        .metric-block { padding: 1.2em 0 1.2em 0; border-radius: 12px; background: #fafbfc; border: 1px solid #eee; text-align: center; margin-bottom: 0.5em; }
-        </style>
-    """, unsafe_allow_html=True)
-    st.markdown('<div class="main-title">快速診療指引</div>', unsafe_allow_html=True)
-    
-    nodes_df, relationships_df = data
-    
-    # 檢查數據是否正確載入
-    if nodes_df is None or relationships_df is None:
-        st.error("無法載入數據，請確認數據來源設置是否正確")
-        return
-    
-    # 檢查必要的節點類型是否存在
-    required_node_types = {'Treatment', 'Stage'}  # Drug is optional
-    existing_types = set(nodes_df['type'].unique())
-    missing_types = required_node_types - existing_types
-    if missing_types:
-        st.error(f"數據缺少必要的節點類型: {', '.join(missing_types)}")
-        return
-    
-    # 檢查必要的關係類型是否存在
-    required_relations = {'STAGE_TREATMENT'}  # USES_DRUG and HAS_EVIDENCE_LEVEL are optional
-    existing_relations = set(relationships_df['predicate'].unique())
-    missing_relations = required_relations - existing_relations
-    if missing_relations:
-        st.error(f"數據缺少必要的關係類型: {', '.join(missing_relations)}")
-        return
-    
-    # 初始化 session state
-    if 'mmse_score' not in st.session_state:
-        st.session_state.mmse_score = 20
-    
-    # 疾病選擇器
-    disease_nodes = nodes_df[nodes_df['type'] == 'disease']
-    if disease_nodes.empty:
-        st.error("無法找到疾病節點，請確認數據")
-        return
-    disease_options = disease_nodes['name'].tolist()
-    default_index = 0
-    if "Alzheimer disease" in disease_options:
-        default_index = disease_options.index("Alzheimer disease")
-    selected_disease_name = st.selectbox("選擇疾病", disease_options, index=default_index)
-    selected_disease_id = disease_nodes[disease_nodes['name'] == selected_disease_name]['node_id'].iloc[0]
+    # 合併自多個來源的數據可能有重複的邊，保留順序去除重複階段
+    return list(dict.fromkeys(stages))
 
-    # 2. MMSE分數輸入改為三選一
-    selected_stage_group = st.selectbox("選擇疾病階段", list(STAGE_MAPPING.keys()))
-    current_stages = match_stage_nodes(nodes_df, STAGE_MAPPING[selected_stage_group])
-    st.info(f"📋 當前階段: {selected_stage_group} ({'、'.join(current_stages)})")
+@st.cache_data(hash_funcs={pd.DataFrame: frame_cache_key})
+def get_disease_options(nodes_df):
+    """疾病選單的選項與 名稱 -> node_id 對照（同名時取第一筆；同一份數據只計算一次）"""
+    disease_nodes = get_nodes_by_type(nodes_df, 'disease')
+    disease_ids = disease_nodes.drop_duplicates('name').set_index('name')['node_id'].to_dict()
+    return disease_nodes['name'].tolist(), disease_ids
 
-    # 檢查階段是否存在於數據中
-    stage_exists = nodes_df[nodes_df['name'].isin(current_stages)].shape[0] > 0
-    if not stage_exists:
-        st.error(f"在數據中找不到對應的疾病階段: {selected_stage_group}")
-        return
-        
-    st.write("### 治療建議")
+@st.cache_data(hash_funcs={pd.DataFrame: frame_cache_key})
+def compute_treatments(nodes_df, relationships_df, selected_disease_id, current_stages):
+    """整理疾病與階段對應的治療方案列表（同一組輸入只計算一次，rerun 時直接取回）
     
-    # 獲取所有治療方案（包括 Therapy 和 Treatment）
-    therapy_nodes = nodes_df[nodes_df['type'] == 'Therapy']
-    treatment_nodes = nodes_df[nodes_df['type'] == 'Treatment']
+    Returns:
+        tuple: (treatments_data, debug_info) 治療方案資料列與 Treatment 適用階段的判斷紀錄
+    """
+    therapy_nodes = get_nodes_by_type(nodes_df, 'Therapy')
+    treatment_nodes = get_nodes_by_type(nodes_df, 'Treatment')
     
-    if len(therapy_nodes) == 0 and len(treatment_nodes) == 0:
-        st.info("目前沒有可用的治療方案數據")
-        return
-        
     # 創建治療方案數據表
     treatments_data = []
     
     # 獲取當前階段的所有節點ID
     stage_ids = nodes_df[nodes_df['name'].isin(current_stages)]['node_id'].tolist()
     
+    # 關係依 (subject, predicate) / (object, predicate) 建索引、節點依 node_id 建索引，
+    # 每個治療方案只做查表，不再逐一掃描整個資料表（索引在各次 rerun 間共用）
+    by_subject = get_relationship_index(relationships_df, ('subject', 'predicate'))
+    by_object = get_relationship_index(relationships_df, ('object', 'predicate'))
+    node_by_id = get_node_index(nodes_df)
+    node_names = node_by_id['name']
+    
     # 處理 Therapy 節點
     for _, therapy in therapy_nodes.iterrows():
         therapy_id = therapy['node_id']
         
         # 獲取藥物資訊
-        drug_relations = relationships_df[
-            (relationships_df['subject'] == therapy_id) &
-            (relationships_df['predicate'] == 'DRUG_TREATMENT')
-        ] if 'DRUG_TREATMENT' in existing_relations else pd.DataFrame()
+        drug_relations = lookup_relationships(relationships_df, by_subject, (therapy_id, 'DRUG_TREATMENT'))
         
         drugs = []
-        for _, rel in drug_relations.iterrows():
-            drug_name, _ = get_node_by_id(nodes_df, rel['object'])
+        for drug_id in drug_relations['object']:
+            drug_name = node_names.get(drug_id)
             if drug_name:
                 drugs.append(drug_name)
-        drugs_text = ', '.join(drugs) if drugs else ''
+        drugs_text = ', '.join(dict.fromkeys(drugs)) if drugs else ''
         
         # 獲取證據等級
         evidence = ''
-        evidence_relations = relationships_df[
-            (relationships_df['subject'] == therapy_id) &
-            (relationships_df['predicate'] == 'THERAPY_EVIDENCE_LEVEL')
-        ] if 'THERAPY_EVIDENCE_LEVEL' in existing_relations else pd.DataFrame()
+        evidence_relations = lookup_relationships(relationships_df, by_subject, (therapy_id, 'THERAPY_EVIDENCE_LEVEL'))
         
         if not evidence_relations.empty:
             evidence_node_id = evidence_relations.iloc[0]['object']
-            evidence_node = nodes_df[nodes_df['node_id'] == evidence_node_id]
-            if not evidence_node.empty:
-                evidence = evidence_node.iloc[0]['name']
+            if evidence_node_id in node_by_id.index:
+                evidence = node_by_id.at[evidence_node_id, 'name']
         
         # 獲取來源資訊
-        source_relations = relationships_df[
-            (relationships_df['subject'] == therapy_id) &
-            (relationships_df['predicate'] == 'SOURCE')
-        ]
+        source_relations = lookup_relationships(relationships_df, by_subject, (therapy_id, 'SOURCE'))
         source = ''
         source_type = ''
-        update_date = pd.Timestamp.now()
+        update_date = None  # 無來源日期時由 render 補上當天日期
         
         if not source_relations.empty:
             source_node_id = source_relations.iloc[0]['object']
-            source_node = nodes_df[nodes_df['node_id'] == source_node_id]
-            if not source_node.empty:
-                node_data = source_node.iloc[0]
+            if source_node_id in node_by_id.index:
+                node_data = node_by_id.loc[source_node_id]
                 source = node_data.get('source_secondary', '')  # 來源單位名稱
                 source_type = node_data.get('source_primary', '')  # 來源類型
                 
@@ -203,11 +145,8 @@ def render(data):
         
         # 嘗試取得 Therapy 的 is_effective
         is_effective_val = None
-        rels = relationships_df[
-            (relationships_df['subject'] == selected_disease_id) &
-            (relationships_df['object'] == therapy_id) &
-            (relationships_df['predicate'] == 'DISEASES_THERAPY')
-        ]
+        rels = lookup_relationships(relationships_df, by_subject, (selected_disease_id, 'DISEASES_THERAPY'))
+        rels = rels[rels['object'] == therapy_id]
         if not rels.empty:
             is_effective_val = rels.iloc[0].get('is_effective', None)
         # 建議判斷（只有 is_effective_val 嚴格等於 1 才為 True）
@@ -223,31 +162,28 @@ def render(data):
             '證據等級': evidence,
             '來源單位': source,
             '來源類型': source_type,
-            '更新日期': update_date.strftime('%Y-%m-%d')
+            '更新日期': update_date.strftime('%Y-%m-%d') if update_date is not None else None
         })
     
-    # 處理 Treatment 節點
+    # 處理 Treatment 節點（當前階段名稱只需標準化一次）
+    normalized_current_stages = [normalize_stage_name(s) for s in current_stages]
     debug_info = []
     for _, treatment in treatment_nodes.iterrows():
         treatment_id = treatment['node_id']
         
         # 獲取藥物資訊
-        drug_relations = relationships_df[
-            (relationships_df['subject'] == treatment_id) &
-            (relationships_df['predicate'] == 'DRUG_TREATMENT')
-        ] if 'DRUG_TREATMENT' in existing_relations else pd.DataFrame()
+        drug_relations = lookup_relationships(relationships_df, by_subject, (treatment_id, 'DRUG_TREATMENT'))
         
         drugs = []
-        for _, rel in drug_relations.iterrows():
-            drug_name, _ = get_node_by_id(nodes_df, rel['object'])
+        for drug_id in drug_relations['object']:
+            drug_name = node_names.get(drug_id)
             if drug_name:
                 drugs.append(drug_name)
-        drugs_text = ', '.join(drugs) if drugs else ''
+        drugs_text = ', '.join(dict.fromkeys(drugs)) if drugs else ''
         
         # 獲取適用階段
-        applicable_stages = get_applicable_stages(treatment_id, nodes_df, relationships_df)
+        applicable_stages = get_applicable_stages(treatment_id, relationships_df, by_object, node_names)
         # 標準化比對，允許部分比對
-        normalized_current_stages = [normalize_stage_name(s) for s in current_stages]
         normalized_applicable_stages = [normalize_stage_name(s) for s in applicable_stages]
         is_applicable = any(
             any(ncs in nas or nas in ncs for ncs in normalized_current_stages)
@@ -257,31 +193,23 @@ def render(data):
         
         # 獲取證據等級
         evidence = ''
-        evidence_relations = relationships_df[
-            (relationships_df['subject'] == treatment_id) &
-            (relationships_df['predicate'] == 'TREATMENT_EVIDENCE_LEVEL')
-        ] if 'TREATMENT_EVIDENCE_LEVEL' in existing_relations else pd.DataFrame()
+        evidence_relations = lookup_relationships(relationships_df, by_subject, (treatment_id, 'TREATMENT_EVIDENCE_LEVEL'))
         
         if not evidence_relations.empty:
             evidence_node_id = evidence_relations.iloc[0]['object']
-            evidence_node = nodes_df[nodes_df['node_id'] == evidence_node_id]
-            if not evidence_node.empty:
-                evidence = evidence_node.iloc[0]['name']
+            if evidence_node_id in node_by_id.index:
+                evidence = node_by_id.at[evidence_node_id, 'name']
         
         # 獲取來源資訊
-        source_relations = relationships_df[
-            (relationships_df['subject'] == treatment_id) &
-            (relationships_df['predicate'] == 'SOURCE')
-        ]
+        source_relations = lookup_relationships(relationships_df, by_subject, (treatment_id, 'SOURCE'))
         source = ''
         source_type = ''
-        update_date = pd.Timestamp.now()
+        update_date = None  # 無來源日期時由 render 補上當天日期
         
         if not source_relations.empty:
             source_node_id = source_relations.iloc[0]['object']
-            source_node = nodes_df[nodes_df['node_id'] == source_node_id]
-            if not source_node.empty:
-                node_data = source_node.iloc[0]
+            if source_node_id in node_by_id.index:
+                node_data = node_by_id.loc[source_node_id]
                 source = node_data.get('source_secondary', '')  # 來源單位名稱
                 source_type = node_data.get('source_primary', '')  # 來源類型
                 
@@ -295,11 +223,8 @@ def render(data):
         
         # 取得 is_effective 值
         is_effective_val = None
-        rels = relationships_df[
-            (relationships_df['subject'] == selected_disease_id) &
-            (relationships_df['object'] == treatment_id) &
-            (relationships_df['predicate'] == 'DISEASES_TREATMENT')
-        ]
+        rels = lookup_relationships(relationships_df, by_subject, (selected_disease_id, 'DISEASES_TREATMENT'))
+        rels = rels[rels['object'] == treatment_id]
         if not rels.empty:
             is_effective_val = rels.iloc[0].get('is_effective', None)
         # 建議判斷（只有 is_applicable 且 is_effective_val 嚴格等於 1 才為 True）
@@ -313,7 +238,7 @@ def render(data):
             '證據等級': evidence,
             '來源單位': source,
             '來源類型': source_type,
-            '更新日期': update_date.strftime('%Y-%m-%d'),
+            '更新日期': update_date.strftime('%Y-%m-%d') if update_date is not None else None,
             'is_effective': is_effective_val
         })
         debug_info.append({
@@ -327,6 +252,84 @@ def render(data):
     # 只保留 Therapy 或 is_applicable 為 True 的 Treatment
     treatments_data = [row for row in treatments_data if row['類型'] == 'Therapy' or (row['類型'] == 'Treatment' and row['is_effective'] == 1)]
     
+    return treatments_data, debug_info
+
+def render(data):
+    """渲染快速診療指引頁面"""
+    st.markdown("""
+        <style>
+        .main-title { font-size: 1.7rem; font-weight: 400; color: #222; margin-bottom: 0.2em; letter-spacing: 1px; }
+        .page-title { font-size: 1.7rem; font-weight: 400; color: #555; margin-bottom: 0.1em; letter-spacing: 0.5px; }
+        .section-title { font-size: 1.25rem; font-weight: 400; color: #888; margin-bottom: 0.8em; letter-spacing: 0.5px; }
+        .metric-label { color: #888; font-size: 1.1rem; margin-bottom: 0.1em; }
+        .metric-value { font-size: 2.5rem; font-weight: 700; color: #222; }
+        .metric-block { padding: 1.2em 0 1.2em 0; border-radius: 12px; background: #fafbfc; border: 1px solid #eee; text-align: center; margin-bottom: 0.5em; }
+        </style>
+    """, unsafe_allow_html=True)
+    st.markdown('<div class="main-title">快速診療指引</div>', unsafe_allow_html=True)
+    
+    nodes_df, relationships_df = data
+    
+    # 檢查數據是否正確載入
+    if nodes_df is None or relationships_df is None:
+        st.error("無法載入數據，請確認數據來源設置是否正確")
+        return
+    
+    # 檢查必要的節點類型是否存在
+    required_node_types = {'Treatment', 'Stage'}  # Drug is optional
+    existing_types = set(get_type_index(nodes_df, 'type'))
+    missing_types = required_node_types - existing_types
+    if missing_types:
+        st.error(f"數據缺少必要的節點類型: {', '.join(missing_types)}")
+        return
+    
+    # 檢查必要的關係類型是否存在
+    required_relations = {'STAGE_TREATMENT'}  # USES_DRUG and HAS_EVIDENCE_LEVEL are optional
+    existing_relations = set(get_type_index(relationships_df, 'predicate'))
+    missing_relations = required_relations - existing_relations
+    if missing_relations:
+        st.error(f"數據缺少必要的關係類型: {', '.join(missing_relations)}")
+        return
+    
+    # 初始化 session state
+    if 'mmse_score' not in st.session_state:
+        st.session_state.mmse_score = 20
+    
+    # 疾病選擇器
+    disease_options, disease_ids = get_disease_options(nodes_df)
+    if not disease_options:
+        st.error("無法找到疾病節點，請確認數據")
+        return
+    default_index = 0
+    if "Alzheimer disease" in disease_options:
+        default_index = disease_options.index("Alzheimer disease")
+    selected_disease_name = st.selectbox("選擇疾病", disease_options, index=default_index)
+    selected_disease_id = disease_ids[selected_disease_name]
+
+    # 2. MMSE分數輸入改為三選一
+    selected_stage_group = st.selectbox("選擇疾病階段", list(STAGE_MAPPING.keys()))
+    current_stages = match_stage_nodes(nodes_df, STAGE_MAPPING[selected_stage_group])
+    st.info(f"📋 當前階段: {selected_stage_group} ({'、'.join(current_stages)})")
+
+    # 檢查階段是否存在於數據中
+    stage_exists = nodes_df[nodes_df['name'].isin(current_stages)].shape[0] > 0
+    if not stage_exists:
+        st.error(f"在數據中找不到對應的疾病階段: {selected_stage_group}")
+        return
+        
+    st.write("### 治療建議")
+    
+    # 獲取所有治療方案（包括 Therapy 和 Treatment）
+    therapy_nodes = get_nodes_by_type(nodes_df, 'Therapy')
+    treatment_nodes = get_nodes_by_type(nodes_df, 'Treatment')
+    
+    if len(therapy_nodes) == 0 and len(treatment_nodes) == 0:
+        st.info("目前沒有可用的治療方案數據")
+        return
+        
+    # 整理治療方案（快取於 compute_treatments）
+    treatments_data, debug_info = compute_treatments(nodes_df, relationships_df, selected_disease_id, current_stages)
+    
     # debug: 顯示所有 Treatment 的適用階段與判斷結果
     #with st.expander("[Debug] Treatment 適用階段對照表"):
     #    st.dataframe(pd.DataFrame(debug_info))
@@ -334,6 +337,8 @@ def render(data):
     if treatments_data:
         # 創建DataFrame
         treatments_df = pd.DataFrame(treatments_data)
+        # 沒有來源日期的方案以當天日期顯示（不放進快取，避免日期停在第一次計算的那天）
+        treatments_df['更新日期'] = treatments_df['更新日期'].fillna(pd.Timestamp.now().strftime('%Y-%m-%d'))
         treatments_df = treatments_df[treatments_df['is_effective'] == 1]
         
         # 過濾控制
@@ -1,13 +1,31 @@
 import streamlit as st
 import pandas as pd
 from utils.visualization import create_schema_visualization
-from utils.data_loader import get_node_by_id
+from utils.data_loader import frame_cache_key, get_data_stats, get_node_index, get_nodes_by_type
 import plotly.express as px
 import tempfile
 import os
 from utils.neo4j_loader import get_neo4j_loader
 import re
 
+@st.cache_data(hash_funcs={pd.DataFrame: frame_cache_key})
+def get_source_links(nodes_df, relationships_df):
+    """來源節點與關係另一端節點的對照表（每筆關係一列；同一份數據只計算一次）
+    
+    Returns:
+        pd.DataFrame: source_id（來源節點ID）與 other_id（關係另一端的節點ID）
+    """
+    source_ids = get_nodes_by_type(nodes_df, 'source')['node_id']
+    subjects = relationships_df['subject']
+    objects = relationships_df['object']
+    # 來源為起點時取終點；來源為終點時取起點（自我迴圈只算一次）
+    outgoing = subjects.isin(source_ids)
+    incoming = objects.isin(source_ids) & (subjects != objects)
+    return pd.concat([
+        pd.DataFrame({'source_id': subjects[outgoing], 'other_id': objects[outgoing]}),
+        pd.DataFrame({'source_id': objects[incoming], 'other_id': subjects[incoming]})
+    ], ignore_index=True)
+
 def render_source_statistics(nodes_df, relationships_df):
     """渲染來源統計資訊"""
     st.write("### 數據來源統計")
@@ -19,7 +37,7 @@ def render_source_statistics(nodes_df, relationships_df):
         st.write("### 來源詳細統計")
         
         # 獲取所有來源節點
-        source_nodes = nodes_df[nodes_df['type'] == 'source']
+        source_nodes = get_nodes_by_type(nodes_df, 'source')
         
         if not source_nodes.empty:
             # Debug: 顯示可能的重複來源
@@ -33,32 +51,23 @@ def render_source_statistics(nodes_df, relationships_df):
             ]
             st.dataframe(debug_df)
             
-            # 獲取與來源相關的關係
-            source_relations = relationships_df[
-                (relationships_df['subject'].isin(source_nodes['node_id'])) |
-                (relationships_df['object'].isin(source_nodes['node_id']))
-            ]
+            # 獲取與來源相關的關係，並一次算出各來源的計數與關聯節點類型
+            source_links = get_source_links(nodes_df, relationships_df)
+            citation_counts = source_links.groupby('source_id').size().to_dict()
+            other_types = source_links['other_id'].map(get_node_index(nodes_df)['type'])
+            cited_types_by_source = {}
+            for linked_source_id, node_type in zip(source_links['source_id'], other_types):
+                if pd.notna(node_type) and node_type:
+                    cited_types_by_source.setdefault(linked_source_id, set()).add(node_type)
             
             # 統計每個來源的計數數量
             source_stats = []
             for _, source in source_nodes.iterrows():
                 source_id = source['node_id']
-                citation_count = len(source_relations[
-                    (source_relations['subject'] == source_id) |
-                    (source_relations['object'] == source_id)
-                ])
+                citation_count = citation_counts.get(source_id, 0)
                 
                 # 獲取被統計的節點類型統計
-                cited_types = set()
-                for _, rel in source_relations.iterrows():
-                    if rel['subject'] == source_id:
-                        node_name, node_type = get_node_by_id(nodes_df, rel['object'])
-                        if node_type:
-                            cited_types.add(node_type)
-                    elif rel['object'] == source_id:
-                        node_name, node_type = get_node_by_id(nodes_df, rel['subject'])
-                        if node_type:
-                            cited_types.add(node_type)
+                cited_types = cited_types_by_source.get(source_id, set())
                 
                 # Use source_secondary for name if available, also keep node_id for debugging
                 source_name = source.get('source_secondary', source['name'])
@@ -142,9 +151,16 @@ def render_source_statistics(nodes_df, relationships_df):
         st.write("### 來源名稱統計")
         
         # 獲取所有來源節點
-        source_nodes = nodes_df[nodes_df['type'] == 'source']
+        source_nodes = get_nodes_by_type(nodes_df, 'source')
         
         if not source_nodes.empty:
+            # 計算與各來源相關的（不重複）節點數量
+            related_counts = (
+                get_source_links(nodes_df, relationships_df)
+                .groupby('source_id')['other_id'].nunique(dropna=False)
+                .to_dict()
+            )
+            
             # 創建treemap數據
             treemap_data = []
             for _, source in source_nodes.iterrows():
@@ -152,23 +168,10 @@ def render_source_statistics(nodes_df, relationships_df):
                 primary = source.get('source_primary', 'Unknown')
                 secondary = source.get('source_secondary', source.get('name', 'Unknown'))
                 
-                # 計算與該來源相關的節點數量
-                related_nodes = set()
-                related_relations = relationships_df[
-                    (relationships_df['subject'] == source_id) |
-                    (relationships_df['object'] == source_id)
-                ]
-                
-                for _, rel in related_relations.iterrows():
-                    if rel['subject'] == source_id:
-                        related_nodes.add(rel['object'])
-                    else:
-                        related_nodes.add(rel['subject'])
-                
                 treemap_data.append({
                     'primary': primary,
                     'secondary': secondary,
-                    'connected_nodes_count': len(related_nodes)
+                    'connected_nodes_count': related_counts.get(source_id, 0)
                 })
             
             treemap_df = pd.DataFrame(treemap_data)
@@ -234,12 +237,14 @@ def render_source_statistics(nodes_df, relationships_df):
             
             # 獲取所有主要來源，按關聯節點數量降序排序
             primary_sources = primary_stats['primary'].tolist()
+            # 主要來源 -> 關聯節點數量，供選項標籤直接查表
+            primary_counts = dict(zip(primary_stats['primary'], primary_stats['connected_nodes_count']))
             
             # 創建選擇框來選擇主要來源，使用排序後的列表
             selected_primary = st.selectbox(
                 "選擇主要來源查看詳細分布",
                 options=primary_sources,
-                format_func=lambda x: f"{x} ({primary_stats[primary_stats['primary'] == x]['connected_nodes_count'].iloc[0]:,} 個關聯節點)"
+                format_func=lambda x: f"{x} ({primary_counts[x]:,} 個關聯節點)"
             )
             
             # 為選中的主要來源創建treemap
@@ -666,7 +671,7 @@ def render(data):
         with total_col2:
             st.markdown('<div class="metric-block"><div class="metric-label">總關係數</div><div class="metric-value">{:,}</div></div>'.format(len(relationships_df)), unsafe_allow_html=True)
         with total_col3:
-            st.markdown('<div class="metric-block"><div class="metric-label">節點類型數</div><div class="metric-value">{:,}</div></div>'.format(len(nodes_df['type'].unique())), unsafe_allow_html=True)
+            st.markdown('<div class="metric-block"><div class="metric-label">節點類型數</div><div class="metric-value">{:,}</div></div>'.format(get_data_stats(nodes_df, relationships_df)['node_type_count']), unsafe_allow_html=True)
         
         st.markdown("---")
         
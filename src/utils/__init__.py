@@ -1,15 +1,27 @@
 from .data_loader import (
     load_data,
+    get_data_stats,
+    frame_cache_key,
     get_node_by_id,
+    get_node_index,
+    get_relationship_index,
+    lookup_relationships,
     get_connected_nodes,
+    get_type_index,
     get_nodes_by_type,
     get_relationships_by_type
 )
 
 __all__ = [
     'load_data',
+    'get_data_stats',
+    'frame_cache_key',
     'get_node_by_id',
+    'get_node_index',
+    'get_relationship_index',
+    'lookup_relationships',
     'get_connected_nodes',
+    'get_type_index',
     'get_nodes_by_type',
     'get_relationships_by_type'
 ] 
\ No newline at end of file
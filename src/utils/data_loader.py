@@ -1,5 +1,6 @@
 import pandas as pd
 from datetime import datetime
+import itertools
 import streamlit as st
 from .neo4j_loader import load_data_from_neo4j
 
@@ -21,53 +22,156 @@ def get_connected_nodes(nodes_df, relationships_df, node_id, direction='both'):
     """
     connected_nodes = []
     
-    if direction in ['outgoing', 'both']:
-        outgoing = relationships_df[relationships_df['subject'] == node_id]
-        for _, rel in outgoing.iterrows():
-            target_name, target_type = get_node_by_id(nodes_df, rel['object'])
-            if target_name:
+    # 相連節點的名稱與類型一次查表取得（同一 node_id 取第一筆，與 get_node_by_id 相同）
+    node_by_id = nodes_df.drop_duplicates('node_id').set_index('node_id')[['name', 'type']]
+    
+    def add_connected(relations, id_column, rel_direction):
+        relations = relations[relations[id_column].isin(node_by_id.index)]
+        found = node_by_id.loc[relations[id_column]]
+        for other_id, predicate, name, node_type in zip(
+            relations[id_column], relations['predicate'], found['name'], found['type']
+        ):
+            if name:
                 connected_nodes.append({
-                    'id': rel['object'],
-                    'name': target_name,
-                    'type': target_type,
-                    'relationship': rel['predicate'],
-                    'direction': 'outgoing'
+                    'id': other_id,
+                    'name': name,
+                    'type': node_type,
+                    'relationship': predicate,
+                    'direction': rel_direction
                 })
     
+    if direction in ['outgoing', 'both']:
+        add_connected(relationships_df[relationships_df['subject'] == node_id], 'object', 'outgoing')
+    
     if direction in ['incoming', 'both']:
-        incoming = relationships_df[relationships_df['object'] == node_id]
-        for _, rel in incoming.iterrows():
-            source_name, source_type = get_node_by_id(nodes_df, rel['subject'])
-            if source_name:
-                connected_nodes.append({
-                    'id': rel['subject'],
-                    'name': source_name,
-                    'type': source_type,
-                    'relationship': rel['predicate'],
-                    'direction': 'incoming'
-                })
+        add_connected(relationships_df[relationships_df['object'] == node_id], 'subject', 'incoming')
     
     return connected_nodes
 
+# load_data 回傳的數據框與其索引：以物件 id 為鍵並保留數據框本身，
+# 數據框仍被持有時 id 不會被其他物件重用，索引只會對應到建立它的那份數據
+_loaded_frames = {}
+_load_generation = itertools.count()
+
+def _register_loaded_frames(*frames):
+    """登記 load_data 回傳的數據框（數據重新載入時取代舊的登記與索引）"""
+    if all(_loaded_frames.get(id(df), (None,))[0] is df for df in frames):
+        return
+    generation = next(_load_generation)
+    _loaded_frames.clear()
+    for df in frames:
+        _loaded_frames[id(df)] = (df, generation, {})
+
+def _loaded_entry(df):
+    entry = _loaded_frames.get(id(df))
+    return entry if entry is not None and entry[0] is df else None
+
+def _loaded_index(df, key, build):
+    """取回 load_data 數據框上快取的索引（第一次使用時建立）；其他數據框回傳 None"""
+    entry = _loaded_entry(df)
+    if entry is None:
+        return None
+    indexes = entry[2]
+    if key not in indexes:
+        indexes[key] = build()
+    return indexes[key]
+
+def frame_cache_key(df):
+    """st.cache_data 的數據框快取鍵
+    
+    load_data 的數據框以載入批次與物件 id 為鍵，不必逐列雜湊；其他數據框依內容雜湊
+    """
+    entry = _loaded_entry(df)
+    if entry is not None:
+        return ('loaded', entry[1], id(df))
+    return ('content', tuple(df.columns), int(pd.util.hash_pandas_object(df).sum()))
+
+def get_node_index(nodes_df):
+    """以 node_id 為索引的節點表（同一 node_id 取第一筆，與 get_node_by_id 相同）
+    
+    load_data 的數據框只建立一次並在各次 rerun 間共用；其他數據框每次重新建立
+    """
+    def build():
+        return nodes_df.drop_duplicates('node_id').set_index('node_id')
+    index = _loaded_index(nodes_df, ('node_index',), build)
+    return index if index is not None else build()
+
+def get_relationship_index(relationships_df, columns):
+    """建立 (columns 值) -> 關係列位置 的索引，查詢時不必掃描整個關係表
+    
+    load_data 的數據框只建立一次並在各次 rerun 間共用；其他數據框每次重新建立
+    
+    Args:
+        relationships_df: 關係數據框
+        columns: 索引欄位，例如 ('subject', 'predicate')
+    """
+    def build():
+        return relationships_df.groupby(list(columns), observed=True, sort=False).indices
+    index = _loaded_index(relationships_df, ('relationship_index', tuple(columns)), build)
+    return index if index is not None else build()
+
+def lookup_relationships(relationships_df, index, key):
+    """依 get_relationship_index 建立的索引取出關係（找不到時為空表）"""
+    return relationships_df.iloc[index.get(key, [])]
+
+def get_type_index(df, column):
+    """依 column 的值（節點 type 或關係 predicate）分組的列位置索引
+    
+    load_data 的數據框只分組一次並在各次 rerun 間共用；其他數據框每次重新分組
+    """
+    def build():
+        return df.groupby(column, observed=True, sort=False).indices
+    index = _loaded_index(df, ('type_index', column), build)
+    return index if index is not None else build()
+
 def get_nodes_by_type(nodes_df, node_type):
     """獲取指定類型的所有節點"""
-    return nodes_df[nodes_df['type'] == node_type]
+    if _loaded_entry(nodes_df) is None:
+        return nodes_df[nodes_df['type'] == node_type]
+    return nodes_df.iloc[get_type_index(nodes_df, 'type').get(node_type, [])]
 
 def get_relationships_by_type(relationships_df, relationship_type):
     """獲取指定類型的所有關係"""
-    return relationships_df[relationships_df['predicate'] == relationship_type]
+    if _loaded_entry(relationships_df) is None:
+        return relationships_df[relationships_df['predicate'] == relationship_type]
+    return relationships_df.iloc[get_type_index(relationships_df, 'predicate').get(relationship_type, [])]
 
-@st.cache_data
-def load_data():
-    """載入Neo4j格式的知識圖譜數據
-    
-    Returns:
-        tuple: (nodes_df, relationships_df) Neo4j格式的節點和關係數據框
-    """
+@st.cache_resource
+def _load_graph():
     try:
         # Load from Neo4j
         return load_data_from_neo4j()
         
     except Exception as e:
         st.error(f"讀取數據時發生錯誤: {str(e)}")
-        return None, None 
\ No newline at end of file
+        return None, None 
+
+def load_data():
+    """載入Neo4j格式的知識圖譜數據
+    
+    以 cache_resource 快取：每次 rerun 直接取回同一份數據框，不必重新複製
+    （各頁面只讀取、不修改這兩個數據框）；回傳的數據框會登記給索引與快取鍵使用
+    
+    Returns:
+        tuple: (nodes_df, relationships_df) Neo4j格式的節點和關係數據框
+    """
+    nodes_df, relationships_df = _load_graph()
+    if nodes_df is not None and relationships_df is not None:
+        _register_loaded_frames(nodes_df, relationships_df)
+    return nodes_df, relationships_df
+
+@st.cache_data(hash_funcs={pd.DataFrame: frame_cache_key})
+def get_data_stats(nodes_df, relationships_df):
+    """計算側邊欄的數據統計（同一份數據只計算一次）
+    
+    load_data 每次回傳同一個數據框物件，快取鍵取自 frame_cache_key，不必逐列雜湊整個數據框
+    
+    Returns:
+        dict: 節點總數、關係總數、節點類型數、關係類型數
+    """
+    return {
+        'node_count': len(nodes_df),
+        'relationship_count': len(relationships_df),
+        'node_type_count': len(nodes_df['type'].unique()),
+        'relationship_type_count': len(relationships_df['predicate'].unique())
+    }
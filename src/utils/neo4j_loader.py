@@ -47,13 +47,12 @@ class Neo4jLoader:
                 n.pubmed_id as pubmed_id,
                 n.country_of_origin as country_of_origin
             """
-            result = session.run(query)
-            records = [record for record in result]
+            # Build the frame straight from the result instead of via one dict per record
+            df = session.run(query).to_df()
             
-            if not records:
+            if df.empty:
                 return pd.DataFrame(columns=['node_id', 'type', 'name', 'source_type'])
                 
-            df = pd.DataFrame([dict(record) for record in records])
             return df
             
     def fetch_relationships(self):
@@ -71,13 +70,11 @@ class Neo4jLoader:
                 b.nodeID as object,
                 r.is_effective as is_effective
             """
-            result = session.run(query)
-            records = [record for record in result]
+            df = session.run(query).to_df()
             
-            if not records:
+            if df.empty:
                 return pd.DataFrame(columns=['subject', 'predicate', 'object', 'is_effective'])
                 
-            df = pd.DataFrame([dict(record) for record in records])
             return df
 
 @st.cache_resource
@@ -124,7 +121,12 @@ def load_data_from_neo4j():
         if missing_rel_columns:
             st.error(f"Missing required relationship columns: {', '.join(missing_rel_columns)}")
             return None, None
-            
+
+        # Few distinct node and relationship types: store them as categories so the
+        # tabs' repeated == filters compare integer codes instead of Python strings
+        nodes_df['type'] = nodes_df['type'].astype('category')
+        relationships_df['predicate'] = relationships_df['predicate'].astype('category')
+
         return nodes_df, relationships_df
         
     except Exception as e:
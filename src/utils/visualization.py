@@ -1,8 +1,5 @@
 import pandas as pd
 import pyvis.network as net
-from .data_loader import get_node_by_id
-import os
-import tempfile
 
 # 定義節點類型的顏色映射
 COLOR_MAP = {
@@ -41,41 +38,36 @@ def create_schema_visualization(data):
     network.toggle_physics(True)
     network.toggle_drag_nodes(True)
     
-    # 添加節點類型
+    # 添加節點類型（只需走訪各類型第一次出現的值）
     added_node_types = set()
-    for _, node in nodes_df.iterrows():
-        node_type = node['type'].lower()  # 轉換為小寫以匹配顏色映射
+    for type_label in nodes_df['type'].drop_duplicates():
+        node_type = type_label.lower()  # 轉換為小寫以匹配顏色映射
         if node_type not in added_node_types:
             network.add_node(
                 node_type,
-                label=node['type'],  # 保持原始大小寫顯示
+                label=type_label,  # 保持原始大小寫顯示
                 color=COLOR_MAP.get(node_type, COLOR_MAP['other']),
                 size=30,
-                title=f"節點類型: {node['type']}"
+                title=f"節點類型: {type_label}"
             )
             added_node_types.add(node_type)
     
-    # 添加關係
-    added_edges = set()
-    for _, rel in relationships_df.iterrows():
-        # 獲取起始和目標節點的類型
-        start_node = nodes_df[nodes_df['node_id'] == rel['subject']]
-        end_node = nodes_df[nodes_df['node_id'] == rel['object']]
-        
-        if not start_node.empty and not end_node.empty:
-            start_type = start_node.iloc[0]['type'].lower()
-            end_type = end_node.iloc[0]['type'].lower()
-            edge_key = (start_type, rel['predicate'], end_type)
-            
-            if edge_key not in added_edges:
-                network.add_edge(
-                    start_type,
-                    end_type,
-                    label=rel['predicate'],
-                    arrows='to',
-                    color='#666666'
-                )
-                added_edges.add(edge_key)
+    # 添加關係：一次查出所有關係兩端的節點類型（同一 node_id 取第一筆），
+    # 去除重複的 (起始類型, 關係, 目標類型) 後再逐一加入
+    node_types = nodes_df.drop_duplicates('node_id').set_index('node_id')['type']
+    edges = pd.DataFrame({
+        'start_type': relationships_df['subject'].map(node_types).str.lower(),
+        'predicate': relationships_df['predicate'],
+        'end_type': relationships_df['object'].map(node_types).str.lower()
+    }).dropna(subset=['start_type', 'end_type']).drop_duplicates()
+    for start_type, predicate, end_type in edges.itertuples(index=False):
+        network.add_edge(
+            start_type,
+            end_type,
+            label=predicate,
+            arrows='to',
+            color='#666666'
+        )
     
     # 設置網絡圖的物理引擎參數
     network.set_options('''
@@ -143,11 +135,12 @@ def create_detail_visualization(data, center_node=None):
         (relationships_df['object'] == center_node)
     ]
     
-    # 添加節點
+    # 添加節點（依 node_id 查表，同一 node_id 取第一筆）
+    node_by_id = nodes_df.drop_duplicates('node_id').set_index('node_id')
     added_nodes = set()
     
     # 添加中心節點
-    center_node_data = nodes_df[nodes_df['node_id'] == center_node].iloc[0]
+    center_node_data = node_by_id.loc[center_node]
     center_node_type = center_node_data['type'].lower()
     network.add_node(
         center_node,
@@ -159,13 +152,10 @@ def create_detail_visualization(data, center_node=None):
     added_nodes.add(center_node)
     
     # 添加相關節點和關係
-    for _, rel in center_relations.iterrows():
-        start_id = rel['subject']
-        end_id = rel['object']
-        
+    for start_id, end_id, predicate in center_relations[['subject', 'object', 'predicate']].itertuples(index=False):
         # 添加起始節點
         if start_id not in added_nodes:
-            start_node = nodes_df[nodes_df['node_id'] == start_id].iloc[0]
+            start_node = node_by_id.loc[start_id]
             start_type = start_node['type'].lower()
             network.add_node(
                 start_id,
@@ -178,7 +168,7 @@ def create_detail_visualization(data, center_node=None):
         
         # 添加目標節點
         if end_id not in added_nodes:
-            end_node = nodes_df[nodes_df['node_id'] == end_id].iloc[0]
+            end_node = node_by_id.loc[end_id]
             end_type = end_node['type'].lower()
             network.add_node(
                 end_id,
@@ -193,7 +183,7 @@ def create_detail_visualization(data, center_node=None):
         network.add_edge(
             start_id,
             end_id,
-            label=rel['predicate'],
+            label=predicate,
             arrows='to',
             color='#666666'
         )
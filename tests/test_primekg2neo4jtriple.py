@@ -0,0 +1,69 @@
+import importlib.util
+import os
+import unittest
+
+import pandas as pd
+import pyarrow as pa
+
+# The converter script's file name starts with a digit, so load it by path
+SCRIPT_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "1_Primekg2Neo4jTriple.py")
+spec = importlib.util.spec_from_file_location("primekg2neo4jtriple", SCRIPT_PATH)
+converter = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(converter)
+
+PROPERTY_COLUMNS = ['external_source_id', 'source_primary', 'source_secondary', 'title',
+                    'source_link', 'source_date', 'pubmed_id', 'country_of_origin']
+
+
+def arrow_frame(columns, rows):
+    """Build a frame typed like read_csv_columns' output (Arrow strings, None as NA)."""
+    data = {col: [row.get(col) for row in rows] for col in columns}
+    return pd.DataFrame(data).astype(pd.ArrowDtype(pa.string()))
+
+
+def triples(*rows):
+    return arrow_frame(converter.RELATIONSHIP_COLUMNS, rows)
+
+
+def properties(*rows):
+    return arrow_frame(PROPERTY_COLUMNS, rows)
+
+
+class CreateNodesTest(unittest.TestCase):
+    def test_blank_source_primary_gets_es_id(self):
+        df = triples({'x_type': 'drug', 'x_name': 'A', 'relation': 'R', 'y_type': 'disease', 'y_name': 'B'})
+        props = properties({'external_source_id': '123', 'source_secondary': 'Some guideline'})
+
+        nodes = converter.create_nodes(df, props)
+
+        source = nodes[nodes['TYPE'] == 'source']
+        self.assertEqual(source['NODE_ID'].tolist(), ['es_1'])
+
+    def test_cochrane_source_keeps_its_id(self):
+        df = triples({'x_type': 'drug', 'x_name': 'A', 'relation': 'R', 'y_type': 'disease', 'y_name': 'B'})
+        props = properties(
+            {'external_source_id': 'CD001', 'source_primary': 'Cochrane Library', 'source_secondary': 'Review'},
+            {'external_source_id': '123', 'source_secondary': 'Some guideline'}
+        )
+
+        nodes = converter.create_nodes(df, props)
+
+        source = nodes[nodes['TYPE'] == 'source']
+        self.assertEqual(source['NODE_ID'].tolist(), ['CD001', 'es_2'])
+
+    def test_node_with_missing_type_is_kept(self):
+        df = triples(
+            {'x_type': 'drug', 'x_name': 'A', 'relation': 'R', 'y_type': 'disease', 'y_name': 'C'},
+            {'x_name': 'B', 'relation': 'R', 'y_type': 'disease', 'y_name': 'C'}
+        )
+
+        nodes = converter.create_nodes(df, properties())
+        relationships = pd.concat(converter.create_relationships(df, nodes))
+
+        self.assertIn('B', nodes['NAME'].tolist())
+        node_b = nodes.loc[nodes['NAME'] == 'B', 'NODE_ID'].iloc[0]
+        self.assertIn(node_b, relationships['START_ID'].tolist())
+
+
+if __name__ == "__main__":
+    unittest.main()